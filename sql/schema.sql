@@ -35,9 +35,10 @@ CREATE TABLE staging_jobs (
     company_name TEXT,
     job_skills TEXT[],
     job_type_skills JSONB,
+    company_key TEXT GENERATED ALWAYS AS (TRIM(COALESCE(company_name, 'Unknown'))) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-CREATE INDEX idx_staging_company ON staging_jobs(company_name);
+CREATE INDEX idx_staging_company ON staging_jobs(company_key);
 CREATE INDEX idx_staging_country ON staging_jobs(job_country);
 CREATE INDEX idx_staging_title_short ON staging_jobs(job_title_short);
 
@@ -98,6 +99,7 @@ CREATE INDEX idx_skills_category ON skills(category_id);
 
 CREATE TABLE jobs (
     job_id SERIAL PRIMARY KEY,
+    staging_id INTEGER,
     job_title VARCHAR(500) NOT NULL,
     job_title_short VARCHAR(100),
     company_id INTEGER NOT NULL REFERENCES companies(company_id),
@@ -115,6 +117,7 @@ CREATE TABLE jobs (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT chk_salary_rate CHECK (salary_rate IN ('hour', 'day', 'week', 'month', 'year') OR salary_rate IS NULL)
 );
+CREATE INDEX idx_jobs_staging ON jobs(staging_id);
 CREATE INDEX idx_jobs_company ON jobs(company_id);
 CREATE INDEX idx_jobs_location ON jobs(location_id);
 CREATE INDEX idx_jobs_posted_date ON jobs(job_posted_date);
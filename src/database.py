@@ -16,6 +16,16 @@ from sqlalchemy.engine import Engine
 
 load_dotenv()
 
+# Connection pool and batched (psycopg2) executemany settings
+ENGINE_OPTIONS = {
+    'pool_size': 8,
+    'max_overflow': 16,
+    'pool_pre_ping': True,
+    'executemany_mode': 'values_plus_batch',
+    'insertmanyvalues_page_size': 10000,
+    'executemany_batch_page_size': 1000,
+}
+
 
 class DatabaseConfig:
     """Database configuration and connection manager"""
@@ -44,7 +54,7 @@ class DatabaseConfig:
         """Get or create database engine"""
         if self.engine is None:
             logger.info(f"Creating database engine for {self.database_url.split('@')[1]}")
-            self.engine = create_engine(self.database_url)
+            self.engine = create_engine(self.database_url, **ENGINE_OPTIONS)
         return self.engine
 
 
@@ -75,13 +85,18 @@ class DatabaseConfig:
             with open(filepath, 'r', encoding='utf-8') as f:
                 sql_commands = f.read()
 
+            # Sent as one script so Postgres does the parsing (semicolons inside
+            # literals, comments or dollar-quoted blocks are handled correctly).
+            # Raw DBAPI cursor without parameters: no '%' interpolation
             engine = self.get_engine()
-            with engine.connect() as conn:
-                for statement in sql_commands.split(';'):
-                    statement = statement.strip()
-                    if statement:
-                        conn.execute(text(statement))
-                conn.commit()
+            connection = engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+                cursor.execute(sql_commands)
+                cursor.close()
+                connection.commit()
+            finally:
+                connection.close()
 
             logger.info(f"Successfully executed SQL file: {filepath}")
             return True
@@ -3,9 +3,11 @@
 Data ingestion module for loading raw CSV data into staging table
 """
 
+import io
 import json
 import ast
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 from loguru import logger
@@ -13,6 +15,12 @@ from loguru import logger
 from database import DatabaseConfig # pylint: disable=import-error
 
 
+
+
+CHUNK_SIZE = 50000
+BOOL_VALUES = {'true': True, 'false': False}
+
+
 class DataIngestion:
     """Handle data ingestion from CSV to database staging table"""
 
@@ -21,109 +29,167 @@ class DataIngestion:
         self.db_config = db_config
 
 
-    def read_csv(self, filepath:str) -> pd.DataFrame:
-        """Read CSV file with proper handling of complex columns"""
-        logger.info(f"Reading CSV file: {filepath}")
-
-        # Define converters for semi-structured columns
-        converters = {
+    def _parse_semi_structured(self, df:pd.DataFrame) -> pd.DataFrame:
+        """Decode the semi-structured columns (in place) after the CSV is read"""
+        parsers = {
             'job_skills': self._parse_list_column,
             'job_type_skills': self._parse_dict_column
         }
-
-        df = pd.read_csv(filepath, converters=converters)
-
-        logger.info(f"Loaded {len(df)} rows from CSV")
-        logger.info(f"Columns: {list(df.columns)}")
-
+        for col, parser in parsers.items():
+            if col in df.columns:
+                # Skill lists repeat a lot: parse each distinct raw value only once
+                codes, uniques = pd.factorize(df[col])
+                parsed = np.empty(len(uniques) + 1, dtype=object) # code -1 (null) -> None
+                for i, value in enumerate(uniques):
+                    parsed[i] = parser(value)
+                df[col] = parsed[codes]
         return df
 
 
     @staticmethod
-    def _parse_list_column(value) -> Optional[list]:
+    def _parse_literal(value:str):
+        """Parse a JSON or Python literal string (C json decoder first)"""
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            pass
+        # Python reprs without double quotes are valid JSON once quotes are swapped
+        if '"' not in value:
+            try:
+                return json.loads(value.replace("'", '"'))
+            except json.JSONDecodeError:
+                pass
+        return ast.literal_eval(value)
+
+
+    @classmethod
+    def _parse_list_column(cls, value) -> Optional[list]:
         """Parse string representation of list to actual list"""
         if pd.isna(value) or value == '' or value == '[]':
             return None
         try:
-            parsed = ast.literal_eval(value)
+            parsed = cls._parse_literal(value)
             return parsed if isinstance(parsed, list) else None
         except (ValueError, SyntaxError):
             return None
 
 
-    @staticmethod
-    def _parse_dict_column(value) -> Optional[dict]:
+    @classmethod
+    def _parse_dict_column(cls, value) -> Optional[dict]:
         """Parse string representation of dict to actual dict"""
         if pd.isna(value) or value == '' or value == '{}':
             return None
         try:
-            parsed = ast.literal_eval(value)
+            parsed = cls._parse_literal(value)
             return parsed if isinstance(parsed, dict) else None
         except (ValueError, SyntaxError):
             return None
 
 
-    def load_to_staging(self, df:pd.DataFrame, batch_size:int=10000):
-        """Load DataFrame to staging table"""
-        logger.info(f"Loading {len(df)} rows to staging table")
+    @staticmethod
+    def _to_pg_array(values:list) -> str:
+        """Format a list as a Postgres array literal for TEXT[] columns"""
+        elements = []
+        for value in values:
+            if value is None:
+                elements.append('NULL')
+            else:
+                escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+                elements.append(f'"{escaped}"')
+        return '{' + ','.join(elements) + '}'
 
-        # Convert Python objects to JSON strings for JSONB columns
-        def to_json_or_none(x): # pragma: no cover
-            if x is None or (isinstance(x, float) and pd.isna(x)):
-                return None
-            return json.dumps(x)
-        # Convert Python objects to ARRAYS for TEXT[] columns
+
+    @staticmethod
+    def _copy_to_staging(cursor, chunk:pd.DataFrame):
+        """Stream a DataFrame chunk into the staging table with COPY"""
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, index=False, header=False, na_rep='\\N')
+        buffer.seek(0)
+
+        columns = ', '.join(chunk.columns)
+        cursor.copy_expert(
+            f"COPY staging_jobs ({columns}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')",
+            buffer
+        )
+
+
+    def _prepare_for_staging(self, df:pd.DataFrame) -> pd.DataFrame:
+        """Convert columns (in place) to the representation expected by staging"""
+        # Convert Python objects to ARRAY literals for TEXT[] columns
         def normalize_skills(x): # pragma: no cover
-            if x is None or (isinstance(x, float) and pd.isna(x)):
-                return None
-            if isinstance(x, list):
-                return x
             if isinstance(x, str):
                 try:
-                    return json.loads(x)  # por si viene como string JSON
+                    x = json.loads(x)  # por si viene como string JSON
                 except Exception: # pylint: disable=broad-exception-caught
                     return None
+            if isinstance(x, list):
+                return self._to_pg_array(x)
             return None
 
-        df_copy = df.copy()
-        df_copy["job_skills"] = df_copy["job_skills"].apply(normalize_skills)
-        df_copy["job_type_skills"] = df_copy["job_type_skills"].apply(to_json_or_none)
+        # Only non-null cells are serialized; nulls pass through untouched.
+        # Columns are always replaced (never written into)
+        df['job_skills'] = df['job_skills'].map(normalize_skills, na_action='ignore')
+        # Convert Python objects to JSON strings for JSONB columns
+        df['job_type_skills'] = df['job_type_skills'].map(json.dumps, na_action='ignore')
 
         # Convert boolean strings to actual booleans
         bool_columns = ['job_work_from_home', 'job_no_degree_mention', 'job_health_insurance']
         for col in bool_columns:
-            if col in df_copy.columns:
-                df_copy[col] = df_copy[col].apply(
-                    lambda x: True if str(x).lower() == 'true' \
-                        else False if str(x).lower() == 'false' else None
-                )
+            if col in df.columns:
+                df[col] = df[col].astype('string').str.lower().map(BOOL_VALUES)
+
+        if 'job_posted_date' in df.columns:
+            df['job_posted_date'] = pd.to_datetime(df['job_posted_date'], errors='coerce')
+
+        return df
+
 
-        if 'job_posted_date' in df_copy.columns:
-            df_copy['job_posted_date'] = pd.to_datetime(df_copy['job_posted_date'], errors='coerce')
+    def _write_chunks(self, chunks:Iterable[pd.DataFrame]) -> int:
+        """Write prepared chunks to the staging table in a single transaction"""
+        rows = 0
 
-        # Load to database
+        # Load to database (COPY avoids per-row INSERT parsing and binding)
         engine = self.db_config.get_engine()
-        with tqdm(total=len(df_copy), desc="Progress") as pbar:
-            for i in range(0, len(df_copy), batch_size):
-                chunk = df_copy.iloc[i : i + batch_size]
-                chunk.to_sql(
-                    'staging_jobs', 
-                    engine,
-                    if_exists='append',
-                    index=False,
-                    method='multi'
-                )
-                pbar.update(len(chunk))
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            with tqdm(desc="Progress") as pbar:
+                for chunk in chunks:
+                    self._copy_to_staging(cursor, chunk)
+                    rows += len(chunk)
+                    pbar.update(len(chunk))
+            cursor.close()
+            connection.commit()
+        finally:
+            connection.close()
+
+        return rows
 
-        logger.info(f"Successfully loaded {len(df)} rows to staging table")
+
+    def read_csv_chunks(self, filepath:str, chunksize:int=CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """Read CSV file lazily in chunks (bounded memory)"""
+        logger.info(f"Streaming CSV file: {filepath} ({chunksize} rows per chunk)")
+
+        # The PyArrow engine does not support chunksize, so the C engine is used here
+        with pd.read_csv(filepath, chunksize=chunksize, dtype_backend='pyarrow') as reader:
+            for chunk in reader:
+                yield self._parse_semi_structured(chunk)
+
+
+    def load_chunks_to_staging(self, chunks:Iterable[pd.DataFrame]) -> int:
+        """Stream DataFrame chunks to staging table (chunks are modified in place)"""
+        logger.info("Streaming chunks to staging table")
+
+        rows = self._write_chunks(self._prepare_for_staging(chunk) for chunk in chunks)
+
+        logger.info(f"Successfully loaded {rows} rows to staging table")
+        return rows
 
 
     def run_ingestion(self, csv_filepath:str): # pragma: no cover
         """Run complete ingestion process"""
         logger.info("Starting data ingestion process")
 
-        df = self.read_csv(csv_filepath)
-
-        self.load_to_staging(df)
+        self.load_chunks_to_staging(self.read_csv_chunks(csv_filepath))
 
         logger.info("Data ingestion completed successfully")
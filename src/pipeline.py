@@ -9,7 +9,7 @@ from loguru import logger
 
 from transformation import DataTransformation # pylint: disable=import-error
 from ingestion import DataIngestion # pylint: disable=import-error
-from validation import DataValidator # pylint: disable=import-error
+from validation import DataValidator, RowSampler, StreamProfile # pylint: disable=import-error
 from database import DatabaseConfig # pylint: disable=import-error
 
 
@@ -29,7 +29,10 @@ class JobPipeline:
             "logs/pipeline_{time}.log", 
             rotation="10 MB",
             retention="10 days",
-            level="INFO"
+            level="INFO",
+            enqueue=True, # file writes happen on a background thread
+            backtrace=False,
+            diagnose=False
         )
 
     def setup_database(self) -> bool:
@@ -57,8 +60,9 @@ class JobPipeline:
             return False
 
     def validate_data(self, df) -> bool:
-        """Validate input data"""
-        logger.info("Validating input data")
+        """Validate input data against the raw schema"""
+        # Schema-only checks run once per streamed chunk: keep them out of INFO
+        logger.debug("Validating input data")
 
         validator = DataValidator()
 
@@ -67,14 +71,38 @@ class JobPipeline:
             logger.error(f"Schema validation failed: {error_msg}")
             return False
 
+        logger.debug("Data validation completed successfully")
+        return True
+
+    def report_data_quality(self, df):
+        """Log quality metrics, skills structure and profile (on a row sample)"""
+        validator = DataValidator()
+
         _ = validator.check_data_quality(df)
 
-        _ = validator.validate_skills_structure(df)
+        skills = validator.validate_skills_structure(df)
+        logger.info(f"Skills structure: "
+                    f"{skills['job_skills']['invalid']} invalid job_skills lists, "
+                    f"{skills['job_type_skills']['invalid']} invalid job_type_skills dicts")
 
         validator.generate_data_profile(df)
 
-        logger.info("Data validation completed successfully")
-        return True
+    def validated_chunks(self, chunks):
+        """Validate each chunk before it is streamed to staging (single pass)"""
+        sampler = RowSampler()
+        stream_profile = StreamProfile()
+        for i, chunk in enumerate(chunks):
+            logger.debug("Validating chunk {} ({} rows)", i + 1, len(chunk))
+            # Schema on every chunk, quality report on a sample of the whole file
+            if not self.validate_data(chunk):
+                raise ValueError("Data validation failed, stopping pipeline")
+            sampler.add(chunk)
+            stream_profile.update(chunk)
+            yield chunk
+
+        if sampler.sample is not None:
+            self.report_data_quality(sampler.sample)
+        logger.opt(lazy=True).debug("Full data profile (all rows):\n{}", lambda: stream_profile.to_string())
 
     def run_ingestion(self) -> bool:
         """Run data ingestion phase"""
@@ -85,13 +113,9 @@ class JobPipeline:
 
             ingestion = DataIngestion(self.db_config)
 
-            df = ingestion.read_csv(self.csv_filepath)
-
-            if not self.validate_data(df):
-                logger.error("Data validation failed, stopping pipeline")
-                return False
-
-            ingestion.load_to_staging(df)
+            # Staging is written in one transaction, so a failing chunk loads nothing
+            chunks = ingestion.read_csv_chunks(self.csv_filepath)
+            ingestion.load_chunks_to_staging(self.validated_chunks(chunks))
 
             logger.info("Phase 1 completed successfully")
             return True
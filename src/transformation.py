@@ -3,9 +3,9 @@
 Data transformation module for normalizing staging data into 3NF schema
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
 import pandas as pd
-from tqdm import tqdm
 from sqlalchemy import text
 from loguru import logger
 
@@ -14,7 +14,18 @@ from database import DatabaseConfig # pylint: disable=import-error
 
 
 
-BATCH_SIZE = 10000
+# Secondary indexes on the fact tables (see sql/schema.sql), rebuilt after bulk load.
+# idx_jobs_staging is kept: populate_job_skills joins jobs on staging_id
+FACT_INDEXES = {
+    'idx_jobs_company': 'jobs(company_id)',
+    'idx_jobs_location': 'jobs(location_id)',
+    'idx_jobs_posted_date': 'jobs(job_posted_date)',
+    'idx_jobs_title_short': 'jobs(job_title_short)',
+    'idx_jobs_remote': 'jobs(job_work_from_home)',
+    'idx_job_skills_job': 'job_skills(job_id)',
+    'idx_job_skills_skill': 'job_skills(skill_id)',
+}
+INDEX_BUILD_MEMORY = '1GB'
 
 
 class DataTransformation:
@@ -30,20 +41,47 @@ class DataTransformation:
         """Delete all information in all tables (except staging)"""
         logger.info("Deleting data in all tables")
 
+        # Single TRUNCATE: no per-row WAL/dead tuples, sequences restarted
+        sql = """
+        TRUNCATE TABLE
+            job_skills,
+            jobs,
+            skills,
+            skill_categories,
+            companies,
+            locations,
+            platforms,
+            schedule_types
+        RESTART IDENTITY CASCADE;
+        """
+
         with self.engine.connect() as conn:
-            conn.execute(text("DELETE FROM job_skills"))
-            conn.execute(text("DELETE FROM jobs"))
-            conn.execute(text("DELETE FROM skills"))
-            conn.execute(text("DELETE FROM skill_categories"))
-            conn.execute(text("DELETE FROM companies"))
-            conn.execute(text("DELETE FROM locations"))
-            conn.execute(text("DELETE FROM platforms"))
-            conn.execute(text("DELETE FROM schedule_types"))
+            conn.execute(text(sql))
             conn.commit()
 
         logger.info("All data was successfully deleted")
 
 
+    def drop_fact_indexes(self):
+        """Drop secondary indexes on fact tables before the bulk load"""
+        logger.info("Dropping fact table indexes")
+
+        with self.engine.connect() as conn:
+            conn.execute(text(f"DROP INDEX IF EXISTS {', '.join(FACT_INDEXES)}"))
+            conn.commit()
+
+
+    def create_fact_indexes(self):
+        """(Re)create secondary indexes on fact tables after the bulk load"""
+        logger.info("Creating fact table indexes")
+
+        with self.engine.connect() as conn:
+            conn.execute(text(f"SET LOCAL maintenance_work_mem = '{INDEX_BUILD_MEMORY}'"))
+            for index_name, target in FACT_INDEXES.items():
+                conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {target}"))
+            conn.commit()
+
+
     def extract_location_components(
             self, location_string:str, country:str) -> Dict[str, Optional[str]]:
         """Extract city, state/province from location string"""
@@ -87,7 +125,7 @@ class DataTransformation:
 
         sql = """
         INSERT INTO companies (company_name)
-        SELECT DISTINCT TRIM(COALESCE(company_name, 'Unknown'))
+        SELECT DISTINCT company_key
         FROM staging_jobs
         WHERE TRIM(company_name) != ''
         ON CONFLICT (company_name) DO NOTHING;
@@ -103,49 +141,25 @@ class DataTransformation:
         """Populate locations dimension table from staging"""
         logger.info("Populating locations table")
 
-        # First, get all unique location/country combinations from staging
-        sql_select = """
-        SELECT DISTINCT 
-            job_location,
-            job_country
-        FROM staging_jobs
+        # Parse city and state/province server-side ("City, State/Province, Country")
+        sql = """
+        INSERT INTO locations (main_city, main_state_province, country, full_location)
+        SELECT
+            NULLIF(TRIM(SPLIT_PART(job_location, ',', 1)), '') AS main_city,
+            NULLIF(TRIM(SPLIT_PART(job_location, ',', 2)), '') AS main_state_province,
+            COALESCE(job_country, 'Unknown') AS country,
+            COALESCE(job_location, 'Unknown') AS full_location
+        FROM (
+            SELECT DISTINCT job_location, job_country
+            FROM staging_jobs
+        ) s
+        ON CONFLICT (main_city, main_state_province, country, full_location) DO NOTHING;
         """
 
         with self.engine.connect() as conn:
-            result = conn.execute(text(sql_select))
-            locations = result.fetchall()
-
-            logger.info(f"Processing {len(locations)} unique locations")
-
-            # Process each location
-            for loc_row in locations:
-                location_string = loc_row[0]
-                country = loc_row[1]
-
-                # Parse location
-                components = self.extract_location_components(location_string, country)
-
-                # Insert location
-                insert_sql = """
-                INSERT INTO locations (main_city, main_state_province, country, full_location)
-                VALUES (
-                    :main_city, 
-                    :main_state_province, 
-                    COALESCE(:country, 'Unknown'), 
-                    COALESCE(:full_location, 'Unknown')
-                )
-                ON CONFLICT (main_city, main_state_province, country, full_location) DO NOTHING
-                """
-
-                conn.execute(text(insert_sql), {
-                    'main_city': components['city'],
-                    'main_state_province': components['state_province'],
-                    'country': components['country'],
-                    'full_location': location_string
-                })
-
+            result = conn.execute(text(sql))
             conn.commit()
-            logger.info("Locations populated successfully")
+            logger.info(f"Inserted {result.rowcount} locations")
 
 
     def populate_platforms(self):
@@ -190,80 +204,52 @@ class DataTransformation:
         """Populate skill categories and skills tables from staging"""
         logger.info("Populating skill categories and skills tables")
 
-        # Get all job_type_skills (which contains skill categories)
-        sql_select = """
-        SELECT DISTINCT job_type_skills
-        FROM staging_jobs
-        WHERE job_type_skills IS NOT NULL
+        # Categories are the keys of job_type_skills (JSONB)
+        sql_categories = """
+        INSERT INTO skill_categories (category_name)
+        SELECT DISTINCT je.key
+        FROM staging_jobs s
+        CROSS JOIN LATERAL JSONB_EACH(s.job_type_skills) AS je
+        WHERE JSONB_TYPEOF(s.job_type_skills) = 'object'
+        ON CONFLICT (category_name) DO NOTHING;
         """
 
-        with self.engine.connect() as conn:
-            result = conn.execute(text(sql_select))
-            skill_type_rows = result.fetchall()
-
-            all_categories = set()
-            skills_by_category = {}
-
-            # Extract all categories and skills
-            for row in skill_type_rows:
-                skill_dict = row[0]  # JSONB is returned as dict
-
-                if skill_dict and isinstance(skill_dict, dict):
-                    for category, skills in skill_dict.items():
-                        all_categories.add(category)
-
-                        if category not in skills_by_category:
-                            skills_by_category[category] = set()
-
-                        if isinstance(skills, list):
-                            for skill in skills:
-                                if skill:
-                                    skills_by_category[category].add(skill.lower().strip())
+        # Skills with their categories (values of job_type_skills)
+        sql_skills = """
+        INSERT INTO skills (skill_name, category_id)
+        SELECT DISTINCT LOWER(TRIM(skill)), sc.category_id
+        FROM staging_jobs s
+        CROSS JOIN LATERAL JSONB_EACH(s.job_type_skills) AS je
+        CROSS JOIN LATERAL JSONB_ARRAY_ELEMENTS_TEXT(je.value) AS skill
+        JOIN skill_categories sc ON sc.category_name = je.key
+        WHERE JSONB_TYPEOF(s.job_type_skills) = 'object'
+            AND JSONB_TYPEOF(je.value) = 'array'
+            AND TRIM(skill) != ''
+        ON CONFLICT (skill_name) DO NOTHING;
+        """
 
-            # Insert categories
-            logger.info(f"Inserting {len(all_categories)} skill categories")
-            for category in all_categories:
-                conn.execute(text(
-                    """INSERT INTO skill_categories (category_name)
-                    VALUES (:name) ON CONFLICT DO NOTHING"""
-                ), {'name': category})
+        # Skills that don't have category info (from job_skills column)
+        sql_uncategorized = """
+        INSERT INTO skills (skill_name, category_id)
+        SELECT DISTINCT LOWER(TRIM(skill)), NULL::INTEGER
+        FROM staging_jobs s
+        CROSS JOIN LATERAL UNNEST(s.job_skills) AS skill
+        WHERE s.job_skills IS NOT NULL
+            AND TRIM(skill) != ''
+        ON CONFLICT (skill_name) DO NOTHING;
+        """
 
-            conn.commit()
+        with self.engine.connect() as conn:
+            result = conn.execute(text(sql_categories))
+            logger.info(f"Inserted {result.rowcount} skill categories")
 
-            # Get category IDs
-            result = conn.execute(text("SELECT category_id, category_name FROM skill_categories"))
-            category_map = {row[1]: row[0] for row in result.fetchall()}
-
-            # Insert skills with their categories
-            skill_count = 0
-            for category, skills in skills_by_category.items():
-                category_id = category_map.get(category)
-                for skill in skills:
-                    conn.execute(text(
-                        """INSERT INTO skills (skill_name, category_id) 
-                           VALUES (:name, :cat_id) ON CONFLICT (skill_name) DO NOTHING"""
-                    ), {'name': skill, 'cat_id': category_id})
-                    skill_count += 1
-
-            # Insert skills that don't have category info (from job_skills column)
-            sql_skills = """
-            SELECT DISTINCT unnest(job_skills) AS skill
-            FROM staging_jobs
-            WHERE job_skills IS NOT NULL
-            """
             result = conn.execute(text(sql_skills))
-            uncategorized_skills = result.fetchall()
-
-            for row in uncategorized_skills:
-                skill = row[0].lower().strip()
-                conn.execute(text(
-                    """INSERT INTO skills (skill_name, category_id) 
-                       VALUES (:name, NULL) 
-                       ON CONFLICT (skill_name) DO NOTHING"""
-                ), {'name': skill})
+            skill_count = result.rowcount
+            result = conn.execute(text(sql_uncategorized))
+            skill_count += result.rowcount
 
             conn.commit()
-            logger.info("Inserted skills successfully")
+            logger.info(f"Inserted {skill_count} skills successfully")
 
 
     def populate_jobs(self):
@@ -272,6 +258,7 @@ class DataTransformation:
 
         sql = r"""
         INSERT INTO jobs (
+            staging_id,
             job_title,
             job_title_short,
             company_id,
@@ -288,6 +275,7 @@ class DataTransformation:
             search_location
         )
         SELECT 
+            s.id AS staging_id,
             COALESCE(s.job_title, s.job_title_short) as job_title,
             s.job_title_short,
             c.company_id,
@@ -303,7 +291,7 @@ class DataTransformation:
             s.salary_hour_avg,
             s.search_location
         FROM staging_jobs s
-        LEFT JOIN companies c ON TRIM(COALESCE(s.company_name, 'Unknown')) = c.company_name
+        LEFT JOIN companies c ON s.company_key = c.company_name
         LEFT JOIN locations l ON (
             COALESCE(s.job_country, 'Unknown') = l.country AND COALESCE(s.job_location, 'Unknown') = l.full_location
         )
@@ -313,26 +301,12 @@ class DataTransformation:
         ORDER BY s.id
         """
 
+        # One set-based statement (OFFSET pagination re-scans every previous window)
         with self.engine.connect() as conn:
-            total_rows = conn.execute(text(
-                """SELECT COUNT(*) FROM staging_jobs
-                WHERE NOT (job_title IS NULL AND job_title_short IS NULL)"""
-            )).scalar()
-
-        offset = 0
-        with tqdm(total=total_rows, desc="Progress") as pbar:
-            while offset < total_rows:
-                batch_sql = f"""
-                {sql}
-                LIMIT {BATCH_SIZE} OFFSET {offset}
-                """
-                with self.engine.connect() as conn:
-                    result = conn.execute(text(batch_sql))
-                    conn.commit()
-
-                    rows_inserted = result.rowcount
-                    pbar.update(rows_inserted)
-                    offset += BATCH_SIZE
+            conn.execute(text("SET LOCAL synchronous_commit = off"))
+            result = conn.execute(text(sql))
+            conn.commit()
+            logger.info(f"Inserted {result.rowcount} jobs")
 
 
     def populate_job_skills(self):
@@ -343,40 +317,17 @@ class DataTransformation:
         INSERT INTO job_skills (job_id, skill_id)
         SELECT j.job_id, s_map.skill_id
         FROM jobs j
-        JOIN staging_jobs stg ON j.job_title = stg.job_title 
-            AND j.job_posted_date = stg.job_posted_date
+        JOIN staging_jobs stg ON j.staging_id = stg.id
         CROSS JOIN LATERAL UNNEST(stg.job_skills) AS s_name
         JOIN skills s_map ON LOWER(TRIM(s_name)) = LOWER(s_map.skill_name)
-        ORDER BY j.job_id, s_map.skill_id
+        ON CONFLICT DO NOTHING
         """
 
         with self.engine.connect() as conn:
-            total_rows = conn.execute(text(
-                """
-                SELECT count(*)
-                FROM jobs j
-                JOIN staging_jobs stg ON j.job_title = stg.job_title 
-                    AND j.job_posted_date = stg.job_posted_date
-                CROSS JOIN LATERAL UNNEST(stg.job_skills) AS s_name
-                JOIN skills s_map ON LOWER(TRIM(s_name)) = LOWER(s_map.skill_name)
-                """
-            )).scalar()
-
-        offset = 0
-        with tqdm(total=total_rows, desc="Progress") as pbar:
-            while offset < total_rows:
-                batch_sql = f"""
-                {sql}
-                LIMIT {BATCH_SIZE*10} OFFSET {offset}
-                ON CONFLICT DO NOTHING
-                """
-                with self.engine.connect() as conn:
-                    result = conn.execute(text(batch_sql))
-                    conn.commit()
-
-                    rows_inserted = result.rowcount
-                    pbar.update(rows_inserted)
-                    offset += BATCH_SIZE*10
+            conn.execute(text("SET LOCAL synchronous_commit = off"))
+            result = conn.execute(text(sql))
+            conn.commit()
+            logger.info(f"Inserted {result.rowcount} job skills")
 
 
     def run_transformation(self): # pragma: no cover
@@ -385,14 +336,28 @@ class DataTransformation:
 
         self.delete_previous_info()
 
-        self.populate_companies()
-        self.populate_locations()
-        self.populate_platforms()
-        self.populate_schedule_types()
-        self.populate_skill_categories_and_skills()
+        # Dimensions touch disjoint tables: load them concurrently (one pooled
+        # connection each); the fact tables depend on all of them
+        dimension_loads = [
+            self.populate_companies,
+            self.populate_locations,
+            self.populate_platforms,
+            self.populate_schedule_types,
+            self.populate_skill_categories_and_skills
+        ]
+        with ThreadPoolExecutor(max_workers=len(dimension_loads)) as executor:
+            futures = [executor.submit(load) for load in dimension_loads]
+            for future in futures:
+                future.result()
+
+        # Indexes are built once after the load instead of maintained per row.
+        # A failed load leaves them dropped; the next run rebuilds them
+        self.drop_fact_indexes()
 
         self.populate_jobs()
 
         self.populate_job_skills()
 
+        self.create_fact_indexes()
+
         logger.info("Data transformation completed successfully")
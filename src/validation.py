@@ -3,8 +3,10 @@
 Data validation module using Pandera for data quality checks
 """
 
+import io
 from typing import Optional
 from loguru import logger
+import numpy as np
 import pandas as pd
 import pandera as pa
 from pandera import Column, Check, DataFrameSchema
@@ -13,6 +15,77 @@ from pandera import Column, Check, DataFrameSchema
 
 
 NON_HASHABLE_COLS = ['job_skills', 'job_type_skills']
+NON_HASHABLE_SET = frozenset(NON_HASHABLE_COLS)
+SALARY_RATES = ['hour', 'day', 'week', 'month', 'year']
+SALARY_COLS = ['salary_year_avg', 'salary_hour_avg']
+MEMORY_SAMPLE_ROWS = 1000
+TAG_NULL, TAG_VALID, TAG_INVALID = 0, 1, 2
+MAX_SAMPLE_CATEGORIES = 20
+PROFILE_SAMPLE_SIZE = 500_000
+LOW_CARDINALITY_COLS = [
+    'job_title_short', 'job_country', 'job_schedule_type', 'salary_rate', 'job_via',
+    'job_work_from_home', 'job_no_degree_mention', 'job_health_insurance'
+]
+SAMPLE_SIZE = 100_000
+
+
+class RowSampler:
+    """Uniform row sample (without replacement) over a stream of DataFrames"""
+
+    def __init__(self, size:int=SAMPLE_SIZE, random_state:int=0):
+        """Initialize an empty sample of at most `size` rows"""
+        self.size = size
+        self.rng = np.random.default_rng(random_state)
+        self.sample: Optional[pd.DataFrame] = None
+        self._keys = np.empty(0)
+
+
+    def add(self, df:pd.DataFrame):
+        """Add a chunk: keep the rows with the `size` smallest random keys (bottom-k)"""
+        keys = self.rng.random(len(df))
+        if self.sample is not None:
+            df = pd.concat([self.sample, df])
+            keys = np.concatenate([self._keys, keys])
+
+        if len(df) > self.size:
+            keep = np.sort(np.argpartition(keys, self.size)[:self.size])
+        else:
+            keep = np.arange(len(df))
+        self.sample = df.iloc[keep]
+        self._keys = keys[keep]
+
+
+class StreamProfile:
+    """Online profile (rows, nulls, numeric min/max) accumulated chunk by chunk"""
+
+    def __init__(self):
+        """Initialize an empty profile"""
+        self.rows = 0
+        self.null_counts = pd.Series(dtype='int64')
+        self.minimums = pd.Series(dtype='float64')
+        self.maximums = pd.Series(dtype='float64')
+
+
+    def update(self, df:pd.DataFrame):
+        """Fold one chunk into the running totals"""
+        self.rows += len(df)
+        self.null_counts = self.null_counts.add(df.isna().sum(), fill_value=0).astype('int64')
+
+        numeric = df.select_dtypes('number')
+        self.minimums = pd.concat([self.minimums, numeric.min()], axis=1).min(axis=1)
+        self.maximums = pd.concat([self.maximums, numeric.max()], axis=1).max(axis=1)
+
+
+    def to_string(self) -> str:
+        """Render the accumulated profile"""
+        profile = [f"Rows: {self.rows}"]
+        for col, null_count in self.null_counts.items():
+            null_pct = (null_count / self.rows) * 100 if self.rows else 0.0
+            line = f"{col:25s} | Nulls: {null_count:6d} ({null_pct:5.1f}%)"
+            if col in self.minimums.index:
+                line += f" | Min: {self.minimums[col]:.2f} | Max: {self.maximums[col]:.2f}"
+            profile.append(line)
+        return "\n".join(profile)
 
 
 class DataValidator:
@@ -32,7 +105,7 @@ class DataValidator:
             "job_health_insurance": Column(object, nullable=True),
             "job_country": Column(str, nullable=True),
             "salary_rate": Column(str, nullable=True,
-                                checks=Check.isin(['hour', 'day', 'week', 'month', 'year', None])),
+                                checks=Check.isin(SALARY_RATES + [None])),
             "salary_year_avg": Column(float, nullable=True,
                                     checks=Check.greater_than_or_equal_to(0)),
             "salary_hour_avg": Column(float, nullable=True,
@@ -46,13 +119,33 @@ class DataValidator:
     )
 
 
+    @classmethod
+    def _passes_fast_checks(cls, df:pd.DataFrame) -> bool:
+        """Vectorized equivalent of the schema checks for the common (valid) case"""
+        if not set(cls.raw_data_schema.columns).issubset(df.columns):
+            return False
+        for col in SALARY_COLS:
+            # An all-empty chunk column is read as null[pyarrow], which is not numeric
+            if df[col].isna().all():
+                continue
+            if not pd.api.types.is_numeric_dtype(df[col]) or (df[col] < 0).any():
+                return False
+        rates = df['salary_rate']
+        # isin() on a null[pyarrow] column raises, and an all-null column passes anyway
+        if rates.isna().all():
+            return True
+        return bool((rates.isin(SALARY_RATES) | rates.isna()).all())
+
+
     @classmethod
     def validate_raw_data(cls, df:pd.DataFrame) -> tuple[bool, Optional[str]]:
         """Validate raw CSV data"""
         try:
-            logger.info("Validating raw data")
-            _ = cls.raw_data_schema.validate(df, lazy=True)
-            logger.info("Raw data validation passed")
+            logger.debug("Validating raw data")
+            # Pandera only runs when a check may fail, to produce the detailed report
+            if not cls._passes_fast_checks(df):
+                _ = cls.raw_data_schema.validate(df, lazy=True)
+            logger.debug("Raw data validation passed")
             return True, None
         except pa.errors.SchemaErrors as e:
             error_msg = f"Schema validation failed:\n{e}"
@@ -63,41 +156,61 @@ class DataValidator:
 
 
     @staticmethod
-    def check_data_quality(df:pd.DataFrame) -> dict:
+    def _categorize(df:pd.DataFrame) -> pd.DataFrame:
+        """Shallow copy with the low-cardinality object columns stored as category"""
+        # Arrow/string columns are left alone: casting them is an extra hash pass
+        to_convert = [col for col in LOW_CARDINALITY_COLS if col in df.columns and df[col].dtype == object]
+        if not to_convert:
+            # Nothing to convert (Arrow-backed input): no copy at all
+            return df
+        df = df.copy(deep=False)
+        for col in to_convert:
+            df[col] = df[col].astype('category')
+        return df
+
+
+    @classmethod
+    def check_data_quality(cls, df:pd.DataFrame) -> dict:
         """Perform data quality checks and return statistics"""
         logger.info("Performing data quality checks")
 
-        check_cols = df.columns.difference(NON_HASHABLE_COLS).tolist()
+        check_cols = [col for col in df.columns if col not in NON_HASHABLE_SET]
+        key_columns = ['job_title_short', 'company_name', 'job_country', 'job_schedule_type']
+        # Category codes turn isna/nunique/duplicated into integer scans (dtypes reported as given).
+        # Columns are picked per reduction, so the frame itself is never column-copied
+        frame = cls._categorize(df)
+
+        # One vectorized reduction per metric instead of one pass per column
+        na_counts = frame.isna().sum()[check_cols]
+        missing_pct = (na_counts / len(df)) * 100
+        unique_counts = frame[[col for col in key_columns if col in check_cols]].nunique()
 
         quality_metrics = {
             'total_rows': len(df),
-            'duplicate_rows': int(df.duplicated(subset=check_cols).sum()),
-            'missing_values': {},
-            'unique_values': {},
-            'data_types': {}
+            'duplicate_rows': int(frame.duplicated(subset=check_cols).sum()),
+            # Missing values per column
+            'missing_values': pd.DataFrame(
+                {'count': na_counts, 'percentage': missing_pct.round(2)}
+            ).to_dict(orient='index'),
+            # Unique values for key columns
+            'unique_values': {col: int(count) for col, count in unique_counts.items()},
+            # Data types
+            'data_types': df.dtypes[check_cols].astype(str).to_dict()
         }
 
-        # Missing values per column
-        for col in check_cols:
-            missing_count = df[col].isna().sum()
-            missing_pct = (missing_count / len(df)) * 100
-            quality_metrics['missing_values'][col] = {
-                'count': int(missing_count),
-                'percentage': round(missing_pct, 2)
-            }
-
-        # Unique values for key columns
-        key_columns = ['job_title_short', 'company_name', 'job_country', 'job_schedule_type']
-        for col in key_columns:
-            if col in check_cols:
-                quality_metrics['unique_values'][col] = int(df[col].nunique())
+        logger.info(f"Data quality: {quality_metrics['total_rows']} rows, "
+                    f"{quality_metrics['duplicate_rows']} duplicates")
+        # Full dumps are only rendered when a DEBUG sink is enabled
+        logger.opt(lazy=True).debug("Data quality metrics:\n{}", lambda: quality_metrics)
+        return quality_metrics
 
-        # Data types
-        for col in check_cols:
-            quality_metrics['data_types'][col] = str(df[col].dtype)
 
-        logger.info(f"Data quality metrics:\n{quality_metrics}")
-        return quality_metrics
+    @staticmethod
+    def _type_tags(column:pd.Series, expected:type) -> np.ndarray:
+        """int8 tag per row (null / expected type / anything else) for integer counting"""
+        is_expected = (column.map(type) == expected).to_numpy()
+        not_null = column.notna().to_numpy()
+        return np.where(is_expected, TAG_VALID, np.where(not_null, TAG_INVALID, TAG_NULL)).astype(np.int8)
 
 
     @staticmethod
@@ -122,65 +235,85 @@ class DataValidator:
 
         # Validate job_skills (should be lists)
         if 'job_skills' in df.columns:
-            non_null = df['job_skills'].notna()
-            results['job_skills']['total_non_null'] = int(non_null.sum())
-
-            for skill_list in df[non_null]['job_skills'].head(10):
-                if isinstance(skill_list, list):
-                    results['job_skills']['valid_lists'] += 1
-                    if len(results['job_skills']['sample_values']) < 3:
-                        results['job_skills']['sample_values'].append(skill_list[:3])
-                else:
-                    results['job_skills']['invalid'] += 1
+            tags = DataValidator._type_tags(df['job_skills'], list)
+            _, valid, invalid = np.bincount(tags, minlength=3)
+            results['job_skills']['total_non_null'] = int(valid + invalid)
+            results['job_skills']['valid_lists'] = int(valid)
+            results['job_skills']['invalid'] = int(invalid)
+            results['job_skills']['sample_values'] = [
+                skill_list[:3] for skill_list in df['job_skills'][tags == TAG_VALID].head(3)
+            ]
 
         # Validate job_type_skills (should be dicts)
         if 'job_type_skills' in df.columns:
-            non_null = df['job_type_skills'].notna()
-            results['job_type_skills']['total_non_null'] = int(non_null.sum())
-
-            for skill_dict in df[non_null]['job_type_skills'].head(100):
-                if isinstance(skill_dict, dict):
-                    results['job_type_skills']['valid_dicts'] += 1
-                    results['job_type_skills']['sample_categories'].update(skill_dict.keys())
-                else:
-                    results['job_type_skills']['invalid'] += 1
+            tags = DataValidator._type_tags(df['job_type_skills'], dict)
+            _, valid, invalid = np.bincount(tags, minlength=3)
+            results['job_type_skills']['total_non_null'] = int(valid + invalid)
+            results['job_type_skills']['valid_dicts'] = int(valid)
+            results['job_type_skills']['invalid'] = int(invalid)
+            categories = set()
+            for skill_dict in df['job_type_skills'][tags == TAG_VALID].head(100):
+                categories |= skill_dict.keys()
+                if len(categories) >= MAX_SAMPLE_CATEGORIES:
+                    break
+            results['job_type_skills']['sample_categories'] = categories
 
         results['job_type_skills']['sample_categories'] = list(
             results['job_type_skills']['sample_categories']
         )
 
-        logger.info(f"Skills validation:\n{results}")
+        logger.opt(lazy=True).debug("Skills validation:\n{}", lambda: results)
         return results
 
 
     @staticmethod
-    def generate_data_profile(df:pd.DataFrame) -> str: # pragma: no cover
-        """Generate a text profile of the dataset"""
-        profile = []
-        profile.append("=" * 100)
-        profile.append("DATA PROFILE")
-        profile.append("=" * 100)
+    def _estimate_memory_mb(df:pd.DataFrame, sample_rows:int=MEMORY_SAMPLE_ROWS) -> float:
+        """Estimate deep memory usage (MB) by extrapolating from the first rows"""
+        sample = min(sample_rows, len(df))
+        if sample == 0:
+            return df.memory_usage().sum() / 1024**2
+        return df.head(sample).memory_usage(deep=True).sum() * (len(df) / sample) / 1024**2
+
+
+    @classmethod
+    def generate_data_profile(cls, df:pd.DataFrame, sample:bool=True) -> str:
+        """Generate a text profile of the dataset (column stats on a row sample if it is huge)"""
+        buffer = io.StringIO()
+        write = buffer.write
+        write("=" * 100 + "\nDATA PROFILE\n" + "=" * 100 + "\n")
 
         # Basic info
-        profile.append(f"\nDataset Shape: {df.shape[0]} rows × {df.shape[1]} columns")
-        profile.append(f"Memory Usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+        write(f"\nDataset Shape: {df.shape[0]} rows × {df.shape[1]} columns\n")
+        write(f"Memory Usage: ~{cls._estimate_memory_mb(df):.2f} MB (estimated)\n")
 
         # Column info
-        profile.append("\nColumn Information:")
-        profile.append("-" * 60)
-        for col in df.columns.difference(NON_HASHABLE_COLS).tolist():
-            dtype = df[col].dtype
-            null_count = df[col].isna().sum()
-            null_pct = (null_count / len(df)) * 100
-            unique_count = df[col].nunique()
-
-            profile.append(
-                f"{col:25s} | {str(dtype):10s} | "
-                f"Nulls: {null_count:6d} ({null_pct:5.1f}%) | "
-                f"Unique: {unique_count:6d}"
+        profile_cols = [col for col in df.columns if col not in NON_HASHABLE_SET]
+        # Rows are sampled before the column selection, which copies only the sample
+        view = (
+            df.sample(n=PROFILE_SAMPLE_SIZE, random_state=0)
+            if sample and len(df) > PROFILE_SAMPLE_SIZE else df
+        )[profile_cols]
+        write("\nColumn Information:\n")
+        if len(view) < len(df):
+            # Null counts are scaled up to the full frame, unique counts are sample lower bounds
+            write(f"(sampled {len(view)} rows: nulls extrapolated, uniques within the sample)\n")
+        write("-" * 60 + "\n")
+        categorized = cls._categorize(view)
+        # One reduction per statistic over all columns, then only formatting per column
+        dtypes = df.dtypes[profile_cols]
+        scale = len(df) / max(len(view), 1)
+        null_counts = (categorized.isna().sum() * scale).round().astype('int64')
+        null_pcts = (null_counts / len(df)) * 100
+        unique_counts = categorized.nunique()
+        for col in profile_cols:
+            write(
+                f"{col:25s} | {str(dtypes[col]):10s} | "
+                f"Nulls: {null_counts[col]:6d} ({null_pcts[col]:5.1f}%) | "
+                f"Unique: {unique_counts[col]:6d}\n"
             )
 
-        profile.append("\n" + "=" * 100)
-        profile_str = "\n".join(profile)
+        write("\n" + "=" * 100)
+        profile_str = buffer.getvalue()
 
-        logger.info(f"Data profile:\n{profile_str}")
+        logger.opt(lazy=True).debug("Data profile:\n{}", lambda: profile_str)
+        return profile_str
@@ -3,6 +3,9 @@
 Unit tests for ingestion module
 """
 
+import csv
+import io
+import json
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -25,22 +28,27 @@ class TestDataIngestion:
         return DataIngestion(mock_db_config)
 
 
-    @patch('pandas.read_csv')
-    def test_read_csv(self, mock_read_csv, ingestion):
-        """Test CSV read with correct converters"""
-        mock_df = pd.DataFrame({'job_skills': [None], 'job_type_skills': [None]})
-        mock_read_csv.return_value = mock_df
-        result = ingestion.read_csv("path.csv")
+    def test_parse_semi_structured_distinct_values(self, ingestion):
+        """Test each distinct raw value is parsed only once"""
+        df = pd.DataFrame({
+            'job_skills': ["['python']", None, "['python']", "['sql']", "['python']"],
+            'job_type_skills': [None] * 5
+        })
+        with patch.object(DataIngestion, '_parse_list_column',
+                          side_effect=lambda value: [value]) as mock_parser:
+            result = ingestion._parse_semi_structured(df) # pylint: disable=protected-access
 
-        _, kwargs = mock_read_csv.call_args
-        assert isinstance(result, pd.DataFrame)
-        assert 'converters' in kwargs
-        assert 'job_skills' in kwargs['converters']
-        assert 'job_type_skills' in kwargs['converters']
+        assert mock_parser.call_count == 2
+        assert result['job_skills'].tolist() == [
+            ["['python']"], None, ["['python']"], ["['sql']"], ["['python']"]
+        ]
+        assert result['job_type_skills'].tolist() == [None] * 5
 
 
     @pytest.mark.parametrize("value, expected", [
         ("['Python', 'SQL']", ['Python', 'SQL']),
+        ('["Python", "SQL"]', ['Python', 'SQL']),
+        ("['c++', \"o'reilly\"]", ['c++', "o'reilly"]),
         ("[]", None),
         ("", None),
         (float('nan'), None),
@@ -54,6 +62,8 @@ class TestDataIngestion:
     @pytest.mark.parametrize("value, expected", [
         ("{'cloud': ['aws'], 'programming': ['r', 'python']}",
             {'cloud': ['aws'], 'programming': ['r', 'python']}),
+        ('{"cloud": ["aws"]}', {'cloud': ['aws']}),
+        ("{'libraries': [\"o'reilly\"]}", {'libraries': ["o'reilly"]}),
         ("{}", None),
         (None, None),
         ("not a dict", None),
@@ -63,41 +73,121 @@ class TestDataIngestion:
         assert ingestion._parse_dict_column(value) == expected # pylint: disable=protected-access
 
 
-    @patch('pandas.DataFrame.to_sql')
-    def test_load_to_staging(self, mock_to_sql, ingestion):
-        """Test data cleaning and staging load"""
+    @pytest.mark.parametrize("values, expected", [
+        (['r', 'python'], '{"r","python"}'),
+        (['sql server', 'c#'], '{"sql server","c#"}'),
+        (['say "hi"', 'back\\slash'], '{"say \\"hi\\"","back\\\\slash"}'),
+        (['a', None], '{"a",NULL}'),
+        ([], '{}'),
+    ])
+    def test_to_pg_array(self, ingestion, values, expected):
+        """Test conversion to Postgres array literal"""
+        assert ingestion._to_pg_array(values) == expected # pylint: disable=protected-access
+
+
+    def test_load_chunks_to_staging_serialization(self, ingestion):
+        """Test data cleaning and COPY serialization of a streamed chunk"""
         data = {
             'job_skills': [['r', 'python']],
             'job_type_skills': [{'cloud': ['aws'], 'programming': ['r', 'python']}],
             'job_work_from_home': 'true',
             'job_no_degree_mention': 'FALSE',
-            'job_posted_date': '2026-01-01'
+            'job_posted_date': '2026-01-01',
+            'salary_year_avg': [None],
+            'job_health_insurance': [None]
         }
 
-        mock_engine = MagicMock()
-        ingestion.db_config.get_engine.return_value = mock_engine
+        mock_connection = MagicMock()
+        mock_cursor = mock_connection.cursor.return_value
+        ingestion.db_config.get_engine.return_value.raw_connection.return_value = mock_connection
 
         # Test data types transformation
         df = pd.DataFrame(data)
         captured_chunks = []
 
-        def mock_to_sql_capture(self, *args, **kwargs): # pylint: disable=unused-argument
-            captured_chunks.append(self.copy())
+        def mock_copy_capture(sql, buffer):
+            captured_chunks.append((sql, buffer.read()))
 
-        with patch.object(pd.DataFrame, 'to_sql', mock_to_sql_capture):
-            ingestion.load_to_staging(df, batch_size=1)
-        chunk = captured_chunks[0]
+        mock_cursor.copy_expert.side_effect = mock_copy_capture
+        rows = ingestion.load_chunks_to_staging(iter([df]))
+        sql, content = captured_chunks[0]
+        row = next(csv.reader(io.StringIO(content)))
 
+        assert rows == 1
         assert len(captured_chunks) == 1
-        assert chunk['job_work_from_home'].iloc[0] == True # pylint: disable=singleton-comparison
-        assert chunk['job_no_degree_mention'].iloc[0] == False # pylint: disable=singleton-comparison
-        assert isinstance(chunk['job_posted_date'].iloc[0], pd.Timestamp)
-        assert isinstance(chunk['job_type_skills'].iloc[0], str)
-        assert chunk['job_skills'].iloc[0] == ['r', 'python']
+        assert sql.startswith("COPY staging_jobs (job_skills, job_type_skills, job_work_from_home")
+        assert row[0] == '{"r","python"}'
+        assert json.loads(row[1]) == data['job_type_skills'][0]
+        assert row[2] == 'True'
+        assert row[3] == 'False'
+        assert pd.Timestamp(row[4]) == pd.Timestamp('2026-01-01')
+        assert row[5] == '\\N'
+        assert row[6] == '\\N'
 
         # Test data ingestion
-        ingestion.load_to_staging(df, batch_size=1)
-        name = mock_to_sql.call_args[0][0]
+        mock_connection.commit.assert_called_once()
+        mock_connection.close.assert_called_once()
 
-        assert name == 'staging_jobs'
-        mock_to_sql.assert_called_once()
+
+    @patch('pandas.read_csv')
+    def test_read_csv_chunks(self, mock_read_csv, ingestion):
+        """Test chunked CSV read with post-load parsing per chunk"""
+        chunks = [
+            pd.DataFrame({'job_skills': ["['python']"], 'job_type_skills': [None]}),
+            pd.DataFrame({'job_skills': ["[]"], 'job_type_skills': ["{'cloud': ['aws']}"]})
+        ]
+        mock_read_csv.return_value.__enter__.return_value = iter(chunks)
+        result = list(ingestion.read_csv_chunks("path.csv", chunksize=1))
+
+        _, kwargs = mock_read_csv.call_args
+        assert kwargs['chunksize'] == 1
+        assert kwargs['dtype_backend'] == 'pyarrow'
+        assert 'converters' not in kwargs
+        assert len(result) == 2
+        assert result[0]['job_skills'].iloc[0] == ['python']
+        assert result[1]['job_skills'].iloc[0] is None
+        assert result[1]['job_type_skills'].iloc[0] == {'cloud': ['aws']}
+
+
+    def test_load_chunks_to_staging(self, ingestion):
+        """Test streaming several chunks to staging in one transaction"""
+        mock_connection = MagicMock()
+        ingestion.db_config.get_engine.return_value.raw_connection.return_value = mock_connection
+
+        chunks = [
+            pd.DataFrame({'job_skills': [['r'], None], 'job_type_skills': [None, None]}),
+            pd.DataFrame({'job_skills': [None], 'job_type_skills': [{'cloud': ['aws']}]})
+        ]
+        # Patch the writer seam of the class instead of pandas/psycopg2 globals
+        with patch.object(DataIngestion, '_copy_to_staging') as mock_write:
+            rows = ingestion.load_chunks_to_staging(iter(chunks))
+
+        written = [call.args[1] for call in mock_write.call_args_list]
+        assert rows == 3
+        assert [len(chunk) for chunk in written] == [2, 1]
+        assert written[0]['job_skills'].iloc[0] == '{"r"}'
+        assert written[1]['job_type_skills'].iloc[0] == '{"cloud": ["aws"]}'
+        mock_connection.commit.assert_called_once()
+        mock_connection.close.assert_called_once()
+
+
+    def test_load_arrow_backed_chunks(self, ingestion, tmp_path):
+        """Test Arrow-backed chunks read from disk are serialized like object columns"""
+        mock_connection = MagicMock()
+        mock_cursor = mock_connection.cursor.return_value
+        ingestion.db_config.get_engine.return_value.raw_connection.return_value = mock_connection
+        captured = []
+        mock_cursor.copy_expert.side_effect = lambda sql, buffer: captured.append(buffer.read())
+
+        csv_path = tmp_path / "jobs.csv"
+        csv_path.write_text(
+            "job_skills,job_type_skills,job_work_from_home,salary_year_avg,job_posted_date\n"
+            "\"['sql']\",\"{'databases': ['sql']}\",True,100.5,2023-01-01 10:00:00\n"
+            ",,,,2023-01-02 11:00:00\n"
+        )
+        rows = ingestion.load_chunks_to_staging(ingestion.read_csv_chunks(str(csv_path)))
+        records = list(csv.reader(io.StringIO(captured[0])))
+
+        assert rows == 2
+        assert records[0][:4] == ['{"sql"}', '{"databases": ["sql"]}', 'True', '100.5']
+        assert records[1][:4] == ['\\N'] * 4
@@ -5,7 +5,7 @@ Unit tests for tranformation module
 
 import sys
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, MagicMock
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -75,13 +75,36 @@ class TestDataTransformation:
         mock_conn = mock_engine.connect.return_value.__enter__.return_value
         transformer.delete_previous_info()
 
-        calls = [call[0][0].text for call in mock_conn.execute.call_args_list]
-        assert any("DELETE FROM job_skills" in s for s in calls)
-        assert any("DELETE FROM schedule_types" in s for s in calls)
-        assert not any("DELETE FROM jobs_staging" in s for s in calls)
+        args, _ = mock_conn.execute.call_args
+        sql_sent = args[0].text
+        assert "TRUNCATE TABLE" in sql_sent
+        assert "job_skills" in sql_sent
+        assert "schedule_types" in sql_sent
+        assert "staging_jobs" not in sql_sent
+        assert "RESTART IDENTITY" in sql_sent
+        mock_conn.execute.assert_called_once()
         mock_conn.commit.assert_called_once()
     
 
+    def test_drop_and_create_fact_indexes(self, mock_db_config):
+        """Test fact table indexes drop/rebuild around bulk load"""
+        db_config, mock_engine = mock_db_config
+        transformer = DataTransformation(db_config)
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value
+
+        transformer.drop_fact_indexes()
+        args, _ = mock_conn.execute.call_args
+        assert "DROP INDEX IF EXISTS idx_jobs_company, idx_jobs_location" in args[0].text
+        assert "idx_jobs_staging" not in args[0].text
+
+        mock_conn.execute.reset_mock()
+        transformer.create_fact_indexes()
+        calls = [call[0][0].text for call in mock_conn.execute.call_args_list]
+        assert "maintenance_work_mem" in calls[0]
+        assert "CREATE INDEX IF NOT EXISTS idx_job_skills_skill ON job_skills(skill_id)" in calls
+        assert mock_conn.commit.call_count == 2
+
+
     def test_populate_companies(self, mock_db_config):
         """Test companies insertion"""
         db_config, mock_engine = mock_db_config
@@ -97,17 +120,18 @@ class TestDataTransformation:
 
     
     def test_populate_locations(self, mock_db_config):
-        """Test locations selection and insertion"""
+        """Test locations parsing and insertion (single statement)"""
         db_config, mock_engine = mock_db_config
         transformer = DataTransformation(db_config)
         mock_conn = mock_engine.connect.return_value.__enter__.return_value
-        mock_conn.execute.return_value.fetchall.return_value = [
-            ("New York, NY", "United States"),
-        ]
         transformer.populate_locations()
 
-        assert mock_conn.execute.call_count >= 2
-        mock_conn.commit.assert_called()
+        args, _ = mock_conn.execute.call_args
+        sql_sent = args[0].text
+        assert "INSERT INTO locations" in sql_sent
+        assert "SPLIT_PART(job_location, ',', 2)" in sql_sent
+        mock_conn.execute.assert_called_once()
+        mock_conn.commit.assert_called_once()
 
 
     def test_populate_platforms(self, mock_db_config):
@@ -140,44 +164,51 @@ class TestDataTransformation:
         
         
     def test_populate_skill_categories_and_skills(self, mock_db_config):
-        """Test JSONB parsing and insertion"""
+        """Test JSONB unnesting and insertion"""
         db_config, mock_engine = mock_db_config
         transformer = DataTransformation(db_config)
         mock_conn = mock_engine.connect.return_value.__enter__.return_value
-        mock_conn.execute.return_value.fetchall.side_effect = [
-            [({"programming": ["python", "sql"]},)],
-            [(1, "programming")],
-            [("python",), ("sql",)]
-        ]
+        mock_conn.execute.return_value.rowcount = 2
         transformer.populate_skill_categories_and_skills()
 
-        assert mock_conn.execute.call_count >= 6
-        mock_conn.commit.assert_called()
+        calls = [call[0][0].text for call in mock_conn.execute.call_args_list]
+        assert len(calls) == 3
+        assert "INSERT INTO skill_categories" in calls[0]
+        assert "JSONB_EACH(s.job_type_skills)" in calls[0]
+        assert "JSONB_ARRAY_ELEMENTS_TEXT(je.value)" in calls[1]
+        assert "UNNEST(s.job_skills)" in calls[2]
+        assert all("ON CONFLICT" in s for s in calls)
+        mock_conn.commit.assert_called_once()
 
 
-    @patch('src.transformation.tqdm')
-    def test_populate_jobs(self, _, mock_db_config):
-        """Test jobs insertion (batch)"""
+    def test_populate_jobs(self, mock_db_config):
+        """Test jobs insertion (single statement)"""
         db_config, mock_engine = mock_db_config
         transformer = DataTransformation(db_config)
         mock_conn = mock_engine.connect.return_value.__enter__.return_value
-        mock_conn.execute.return_value.scalar.return_value = 25000
         transformer.populate_jobs()
 
-        assert mock_conn.execute.call_count >= 3
-        mock_conn.commit.assert_called()
+        args, _ = mock_conn.execute.call_args
+        sql_sent = args[0].text
+        assert "INSERT INTO jobs" in sql_sent
+        assert "s.id AS staging_id" in sql_sent
+        assert "OFFSET" not in sql_sent
+        assert mock_conn.execute.call_count == 2
+        mock_conn.commit.assert_called_once()
 
 
-    @patch('src.transformation.tqdm')
-    def test_populate_job_skills(self, _, mock_db_config):
-        """Test job skills insertion (batch)"""
+    def test_populate_job_skills(self, mock_db_config):
+        """Test job skills insertion (single statement)"""
         db_config, mock_engine = mock_db_config
         transformer = DataTransformation(db_config)
         mock_conn = mock_engine.connect.return_value.__enter__.return_value
-        mock_conn.execute.return_value.scalar.return_value = 1000000
         transformer.populate_job_skills()
 
-        assert mock_conn.execute.call_count >= 3
-        mock_conn.commit.assert_called()
-
-
+        args, _ = mock_conn.execute.call_args
+        sql_sent = args[0].text
+        assert "INSERT INTO job_skills" in sql_sent
+        assert "ON j.staging_id = stg.id" in sql_sent
+        assert "ON CONFLICT DO NOTHING" in sql_sent
+        assert "OFFSET" not in sql_sent
+        assert mock_conn.execute.call_count == 2
+        mock_conn.commit.assert_called_once()
@@ -10,7 +10,17 @@ import pandas as pd
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-from src.validation import DataValidator # pylint: disable=wrong-import-position
+from src.validation import DataValidator, RowSampler, StreamProfile # pylint: disable=wrong-import-position
+
+
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_schema():
+    """Validate a one-row null frame once so Pandera's checks are built before the tests"""
+    schema = DataValidator.raw_data_schema
+    dummy = pd.DataFrame({col: [None] for col in schema.columns})
+    schema.validate(dummy)
 
 
 
@@ -65,6 +75,76 @@ class TestDataValidator:
         success, error = DataValidator.validate_raw_data(fake_df)
         assert success is False
         assert "salary_year_avg" in error
+
+
+    def test_validate_raw_data_arrow_backed(self, fake_df):
+        """Test Arrow-backed frames are coerced by the schema when it runs"""
+        skills = ["job_skills", "job_type_skills"]
+        arrow_df = fake_df.drop(columns=skills).convert_dtypes(dtype_backend="pyarrow")
+        arrow_df[skills] = fake_df[skills]
+        assert DataValidator.validate_raw_data(arrow_df) == (True, None)
+
+        arrow_df.loc[1, "salary_rate"] = "century"
+        success, error = DataValidator.validate_raw_data(arrow_df)
+        assert success is False
+        assert "salary_rate" in error
+        assert "dtype" not in error
+
+
+    def test_validate_raw_data_coerces_dtypes(self, fake_df):
+        """Test values of another type are coerced to the schema dtypes, not reported"""
+        fake_df["company_name"] = [123, 456]
+        fake_df["salary_year_avg"] = ["100", None]
+        assert DataValidator.validate_raw_data(fake_df) == (True, None)
+
+
+    def test_validate_raw_data_all_null_salary_chunk(self, fake_df, monkeypatch, tmp_path):
+        """Test an Arrow chunk with an entirely empty salary column stays on the fast path"""
+        skills = ["job_skills", "job_type_skills"]
+        csv_path = tmp_path / "chunk.csv"
+        fake_df.drop(columns=skills).assign(salary_hour_avg=None).to_csv(csv_path, index=False)
+        chunk = pd.read_csv(csv_path, dtype_backend="pyarrow")
+        chunk[skills] = fake_df[skills]
+        assert str(chunk["salary_hour_avg"].dtype) == "null[pyarrow]"
+
+        calls = []
+        monkeypatch.setattr(DataValidator.raw_data_schema, "validate",
+                            lambda df, **kwargs: calls.append(df))
+        assert DataValidator.validate_raw_data(chunk) == (True, None)
+        assert not calls
+
+
+    def test_validate_raw_data_all_null_salary_rate_chunk(self, fake_df, monkeypatch, tmp_path):
+        """Test an Arrow chunk without any salary data stays on the fast path"""
+        skills = ["job_skills", "job_type_skills"]
+        csv_path = tmp_path / "chunk.csv"
+        no_salary = {"salary_rate": None, "salary_year_avg": None, "salary_hour_avg": None}
+        fake_df.drop(columns=skills).assign(**no_salary).to_csv(csv_path, index=False)
+        chunk = pd.read_csv(csv_path, dtype_backend="pyarrow")
+        chunk[skills] = fake_df[skills]
+        assert str(chunk["salary_rate"].dtype) == "null[pyarrow]"
+
+        calls = []
+        monkeypatch.setattr(DataValidator.raw_data_schema, "validate",
+                            lambda df, **kwargs: calls.append(df))
+        assert DataValidator.validate_raw_data(chunk) == (True, None)
+        assert not calls
+
+
+    def test_validate_raw_data_fast_path(self, fake_df, monkeypatch):
+        """Test that Pandera is skipped for valid data and used to report failures"""
+        calls = []
+        schema_validate = DataValidator.raw_data_schema.validate
+        monkeypatch.setattr(DataValidator.raw_data_schema, "validate",
+                            lambda df, **kwargs: calls.append(df) or schema_validate(df, **kwargs))
+
+        assert DataValidator.validate_raw_data(fake_df) == (True, None)
+        assert not calls
+
+        success, error = DataValidator.validate_raw_data(fake_df.drop(columns=["salary_hour_avg"]))
+        assert success is False
+        assert "salary_hour_avg" in error
+        assert len(calls) == 1
     
 
     def test_check_data_quality(self, fake_df):
@@ -80,6 +160,32 @@ class TestDataValidator:
         assert metrics['unique_values']['job_title_short'] == 2
 
 
+    def test_categorize_low_cardinality_columns(self, fake_df):
+        """Test low-cardinality text columns become category on a copy only"""
+        result = DataValidator._categorize(fake_df) # pylint: disable=protected-access
+
+        assert result["job_country"].dtype == "category"
+        assert result["salary_rate"].dtype == "category"
+        assert result["job_title"].dtype == object
+        assert result["job_work_from_home"].dtype == bool
+        assert fake_df["job_country"].dtype == object
+
+        arrow_df = fake_df[["job_country"]].convert_dtypes(dtype_backend="pyarrow")
+        result = DataValidator._categorize(arrow_df) # pylint: disable=protected-access
+        assert result is arrow_df
+
+
+    def test_estimate_memory_mb(self, fake_df):
+        """Test memory estimate extrapolates the head sample to the whole frame"""
+        df = pd.concat([fake_df] * 50, ignore_index=True)
+        exact = df.memory_usage(deep=True).sum() / 1024**2
+
+        estimate_memory_mb = DataValidator._estimate_memory_mb # pylint: disable=protected-access
+        assert estimate_memory_mb(df) == pytest.approx(exact)
+        assert estimate_memory_mb(df, sample_rows=10) == pytest.approx(exact, rel=0.1)
+        assert estimate_memory_mb(df.iloc[:0]) >= 0
+
+
     def test_validate_skills_structure_mixed_data(self):
         """Test valid/invalida detection for lists/dictionaries"""
         df = pd.DataFrame({
@@ -95,3 +201,112 @@ class TestDataValidator:
         assert results['job_type_skills']['total_non_null'] == 2
         assert results['job_type_skills']['valid_dicts'] == 1
         assert 'cloud' in results['job_type_skills']['sample_categories']
+
+
+    def test_validate_skills_structure_scans_whole_column(self):
+        """Test type counts cover every non-null row, not only the first ones"""
+        df = pd.DataFrame({
+            'job_skills': [['sql', 'python', 'r', 'go']] * 15 + ['bad', None],
+            'job_type_skills': [{'cloud': ['aws']}] * 15 + [{'libraries': ['spark']}, []]
+        })
+        results = DataValidator.validate_skills_structure(df)
+
+        assert results['job_skills']['valid_lists'] == 15
+        assert results['job_skills']['invalid'] == 1
+        assert results['job_skills']['sample_values'] == [['sql', 'python', 'r']] * 3
+        assert results['job_type_skills']['valid_dicts'] == 16
+        assert results['job_type_skills']['invalid'] == 1
+        assert sorted(results['job_type_skills']['sample_categories']) == ['cloud', 'libraries']
+
+
+    def test_validate_skills_structure_caps_sample_categories(self):
+        """Test category sampling stops once enough distinct keys were seen"""
+        df = pd.DataFrame({
+            'job_skills': [None] * 30,
+            'job_type_skills': [{f'category_{i}': ['x']} for i in range(30)]
+        })
+        results = DataValidator.validate_skills_structure(df)
+
+        assert results['job_type_skills']['valid_dicts'] == 30
+        assert len(results['job_type_skills']['sample_categories']) == 20
+
+
+    def test_generate_data_profile(self, fake_df, monkeypatch):
+        """Test the profile text reports exact per-column stats, or scaled ones on a sample"""
+        profile = DataValidator.generate_data_profile(fake_df)
+        assert "Dataset Shape: 2 rows" in profile
+
+        monkeypatch.setattr("src.validation.PROFILE_SAMPLE_SIZE", 10)
+        df = pd.concat([fake_df] * 50, ignore_index=True)
+        df.loc[::2, "company_name"] = None
+
+        exact = DataValidator.generate_data_profile(df, sample=False)
+        assert f"{'company_name':25s} | object     | Nulls:     50 ( 50.0%) | Unique:      1" in exact
+        assert f"{'job_title':25s} | object     | Nulls:      0 (  0.0%) | Unique:      2" in exact
+
+        sampled = DataValidator.generate_data_profile(df)
+        rows = df.sample(n=10, random_state=0)["company_name"]
+        nulls = int(rows.isna().sum()) * 10
+        assert 0 < nulls < 100
+        assert (f"{'company_name':25s} | object     | Nulls: {nulls:6d} ({nulls:5.1f}%) | "
+                f"Unique: {rows.nunique():6d}") in sampled
+
+
+    def test_generate_data_profile_sampled(self, fake_df, monkeypatch):
+        """Test huge frames are profiled on a sample with null counts scaled back up"""
+        monkeypatch.setattr("src.validation.PROFILE_SAMPLE_SIZE", 10)
+        df = pd.concat([fake_df] * 50, ignore_index=True)
+        df["job_via"] = None
+
+        sampled = DataValidator.generate_data_profile(df)
+        exact = DataValidator.generate_data_profile(df, sample=False)
+
+        assert "sampled 10 rows" in sampled
+        assert "sampled" not in exact
+        assert "Nulls:    100 (100.0%)" in sampled
+
+
+class TestRowSampler:
+    """Tests for RowSampler class"""
+
+    def test_sample_bounded_over_chunks(self):
+        """Test sample size is bounded and rows come from every chunk"""
+        sampler = RowSampler(size=50, random_state=1)
+        assert sampler.sample is None
+
+        for start in range(0, 1000, 100):
+            sampler.add(pd.DataFrame({'row': range(start, start + 100)}, index=range(start, start + 100)))
+
+        assert len(sampler.sample) == 50
+        assert sampler.sample['row'].is_unique
+        assert sampler.sample['row'].min() < 500 < sampler.sample['row'].max()
+
+
+    def test_sample_keeps_all_rows_when_small(self):
+        """Test small streams are kept entirely"""
+        sampler = RowSampler(size=50)
+        sampler.add(pd.DataFrame({'row': [1, 2]}))
+        sampler.add(pd.DataFrame({'row': [3]}))
+
+        assert sorted(sampler.sample['row'].tolist()) == [1, 2, 3]
+
+
+class TestStreamProfile:
+    """Tests for StreamProfile class"""
+
+    def test_update_accumulates_chunks(self):
+        """Test rows, nulls and min/max across chunks"""
+        profile = StreamProfile()
+        profile.update(pd.DataFrame({'salary': [10.0, np.nan], 'company': ['a', None]}))
+        profile.update(pd.DataFrame({'salary': [5.0, 30.0], 'company': ['b', 'c']}))
+
+        assert profile.rows == 4
+        assert profile.null_counts['salary'] == 1
+        assert profile.null_counts['company'] == 1
+        assert profile.minimums['salary'] == 5.0
+        assert profile.maximums['salary'] == 30.0
+        assert 'company' not in profile.minimums.index
+
+        profile_str = profile.to_string()
+        assert "Rows: 4" in profile_str
+        assert "Min: 5.00 | Max: 30.00" in profile_str